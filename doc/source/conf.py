@@ -13,17 +13,13 @@
 # All configuration values have a default; values that are commented out
 # serve to show the default.
 
-# If extensions (or modules to document with autodoc) are in another directory,
-# add these directories to sys.path here. If the directory is relative to the
-# documentation root, use os.path.abspath to make it absolute, like shown here.
+# API documentation is generated by sphinx-autoapi, which parses the trikit
+# sources statically. trikit does not need to be importable, so no sys.path
+# manipulation is required.
 #
-import os
-import sys
 import sphinx_rtd_theme
 
 
-sys.path.insert(0, os.path.abspath("../.."))
-
 # -- General configuration ------------------------------------------------
 
 # If your documentation needs a minimal Sphinx version, state it here.
@@ -32,19 +28,55 @@ sys.path.insert(0, os.path.abspath("../.."))
 
 # Add any Sphinx extension module names here, as strings. They can be
 # extensions coming with Sphinx (named 'sphinx.ext.*') or your custom
-# ones.
+# ones. viewcode must precede autoapi.extension: AutoAPI only serves source
+# to viewcode if viewcode's events are registered when AutoAPI is set up.
 extensions = [
-	'sphinx.ext.autodoc',
+    'sphinx.ext.viewcode',
+	'autoapi.extension',
 	'sphinx.ext.doctest',
     'sphinx.ext.intersphinx',
     'sphinx.ext.todo',
     'sphinx.ext.coverage',
-    'sphinx.ext.imgmath',
-    'sphinx.ext.viewcode',
+    'sphinx.ext.mathjax',
     'sphinx.ext.githubpages',
 	'sphinxcontrib.napoleon'
 	]
 
+# The Makefile builds with ``-j auto`` by default. All extensions above are
+# parallel read/write safe, and every value set in this file is a plain
+# string, list, dict or bool, so the config pickles cleanly to worker
+# processes. Keep it that way: values that differ between runs (or cannot be
+# pickled) force a full re-read of every document on incremental builds.
+# Math is rendered client-side by MathJax rather than a LaTeX subprocess per
+# equation. viewcode reads module source and object line ranges from
+# AutoAPI's static parse rather than importing trikit, and writes its
+# _modules/ pages to the build directory only, never into source/.
+
+# sphinx-autoapi settings. The hand-written module pages render the API via
+# the autoapimodule/autoapiclass/autoapifunction directives, so AutoAPI's own
+# page tree is neither generated nor added to the toctree.
+autoapi_type = 'python'
+autoapi_dirs = ['../../trikit']
+autoapi_add_toctree_entry = False
+autoapi_generate_api_docs = False
+
+# Set explicitly, since the defaults include 'imported-members', which would
+# re-document names such as BaseChainLadder on every module that imports
+# them. These match the autodoc :members: pages the module pages replaced.
+autoapi_options = ['members', 'undoc-members', 'show-inheritance']
+
+
+def _skip_imported_members(app, what, name, obj, skip, options):
+    # autoapi_options only filters AutoAPI's own pages. The autoapi*
+    # directives filter members through autodoc, so skip imported ones here.
+    if getattr(obj, 'imported', False):
+        return True
+    return None
+
+
+def setup(app):
+    app.connect('autodoc-skip-member', _skip_imported_members)
+
 
 # Napoleon settings
 napoleon_google_docstring = True
@@ -5,12 +5,150 @@ import functools
 import numpy as np
 import pandas as pd
 from scipy import special
-from scipy.stats import norm, lognorm
 from scipy.optimize import root
 from . import BaseChainLadder, BaseChainLadderResult
 from ... import triangle
 
 
+
+def _pow_alpha(C, alpha):
+    """
+    Return ``C`` raised to ``alpha``. The documented values of ``alpha``
+    are handled without dispatching to the general power ufunc.
+
+    Parameters
+    ----------
+    C: np.ndarray
+        Cumulative loss amounts, typically ``MackChainLadder.mod_tri`` values.
+
+    alpha: {0, 1, 2}
+        * ``0``: Straight average of observed individual link ratios.
+        * ``1``: Historical Chain Ladder age-to-age factors.
+        * ``2``: Regression of $C_{k+1}$ on $C_{k}$ with 0 intercept.
+
+    Returns
+    -------
+    np.ndarray
+    """
+    if alpha==0:
+        Ca = np.ones_like(C)
+    elif alpha==1:
+        Ca = C
+    elif alpha==2:
+        Ca = C * C
+    else:
+        Ca = np.power(C, alpha)
+    return(Ca)
+
+
+
+@functools.lru_cache(maxsize=32)
+def _batch_weights(n, dtype):
+    """
+    Return the age-to-age factor indicator shared by every square
+    triangle with ``n`` origin periods: cells (i, j) with i + j < n - 1
+    have an observed link ratio. Since the indicator depends only on
+    ``n`` and ``dtype``, it is built once and reused across
+    ``MackChainLadder.batch_fit`` calls.
+
+    Parameters
+    ----------
+    n: int
+        Number of origin periods in the triangle.
+
+    dtype: np.dtype
+        Floating point type of the returned array.
+
+    Returns
+    -------
+    np.ndarray
+        Read-only ``(n - 1, n - 1)`` array of 1s and 0s.
+    """
+    w = (np.add.outer(np.arange(n - 1), np.arange(n - 1)) < (n - 1)).astype(dtype)
+    w.flags.writeable = False
+    return(w)
+
+
+
+def _mack_core(C, w, F, n, alpha=1, ldfs=None, dtype=np.float64):
+    """
+    Compute Mack loss development factors and development period variance
+    from the values underlying ``MackChainLadder.mod_tri``,
+    ``MackChainLadder.mod_a2aind`` and the triangle's age-to-age factors.
+    Any leading axes of ``C``, ``w`` and ``F`` are treated as batch axes,
+    so a stack of same-shaped triangles is handled in a single call.
+
+    Parameters
+    ----------
+    C: np.ndarray
+        Cumulative loss amounts with the latest diagonal removed.
+
+    w: np.ndarray
+        Age-to-age factor indicator. Included cells are 1, excluded cells 0.
+
+    F: np.ndarray
+        Age-to-age factors.
+
+    n: int
+        Number of origin periods in the triangle.
+
+    alpha: {0, 1, 2}
+        * ``0``: Straight average of observed individual link ratios.
+        * ``1``: Historical Chain Ladder age-to-age factors.
+        * ``2``: Regression of $C_{k+1}$ on $C_{k}$ with 0 intercept.
+
+    ldfs: np.ndarray
+        Loss development factors excluding the tail factor. If None,
+        ldfs are computed from ``C``, ``w`` and ``F``.
+
+    dtype: np.dtype
+        Floating point type of all intermediate and returned arrays.
+        Defaults to ``np.float64``.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        ldfs and development period variance, each with one element per
+        column of ``C``.
+    """
+    C, w, F = (np.asarray(ii, dtype=dtype) for ii in (C, w, F))
+    if not C.shape==w.shape==F.shape:
+        raise ValueError(
+            "C, w and F must share the same shape, not `{}`, `{}` and `{}`.".format(
+                C.shape, w.shape, F.shape
+                )
+            )
+    if ldfs is not None:
+        ldfs = np.asarray(ldfs, dtype=dtype)
+
+    # Zero excluded cells so NaN values there cannot propagate into sums.
+    C = np.where(w==0, 0., C)
+    Ca = w * _pow_alpha(C, alpha)
+
+    # Zero factors wherever the weight is 0. This covers excluded cells and
+    # included cells with C = 0 and F = inf, whose 0 * inf products pandas'
+    # NaN-skipping sums ignore.
+    F = np.where(Ca==0, 0., F)
+    if ldfs is None:
+        ldfs = np.einsum("...ij,...ij->...j", F, Ca) / np.einsum("...ij->...j", Ca)
+
+    # Weighted squared deviations summed by development period, skipping
+    # NaN deviations from NaN or infinite ldfs as pandas does. There is
+    # one divisor per column of C but the last, and the divisor for the
+    # k-th column (1-based) is n - k - 1, with n the number of origin
+    # periods. It does not depend on dev period labels. For a full square
+    # triangle this is one less than the number of link ratios in the
+    # column. The final period's variance is extrapolated from the prior
+    # two as min(a^2 / b, a, b) (Mack, 1993).
+    denoms = (n - np.arange(2, C.shape[-1] + 1)).astype(dtype)
+    devpvar = np.nansum(Ca * (F - np.expand_dims(ldfs, -2))**2, axis=-2)
+    devpvar[..., :-1] = devpvar[..., :-1] / denoms
+    a, b = devpvar[..., -2], devpvar[..., -3]
+    devpvar[..., -1] = np.minimum(np.minimum(a * a / b, a), b)
+    return(ldfs, devpvar)
+
+
+
 class MackChainLadder(BaseChainLadder):
     """
     Mack Chain Ladder estimator. The predicition variance is comprised
@@ -55,6 +193,21 @@ class MackChainLadder(BaseChainLadder):
         # Properties.
         self._mod_a2aind = None
         self._mod_tri = None
+        self._mod_values = None
+
+        # Mack ldfs (excluding tail) keyed by alpha, and the index of ldfs
+        # including the tail period.
+        self._ldfs_cache = {}
+        self._ldfs_index = None
+
+        # Triangle attributes bound once. tri.a2a returns a sorted copy on
+        # every access, while tri.a2aind returns its cached frame.
+        self._a2a = self.tri.a2a
+        self._a2aind = self.tri.a2aind
+        self._n = self.tri.index.size
+
+        # Contiguous float64 values of the triangle.
+        self._tri_np = np.ascontiguousarray(self.tri.to_numpy(dtype=np.float64))
 
 
 
@@ -164,7 +317,7 @@ class MackChainLadder(BaseChainLadder):
         trisqrd.columns = range(1, trisqrd.columns.size + 1)
 
         # Compute mse for aggregate reserve.
-        n = self.tri.devp.size
+        n = self.tri.columns.size
         mse_total = pd.Series(index=dfsumm.index[:-1], dtype=np.float)
         quotient = pd.Series(devpvar / ldfs**2, dtype=np.float).reset_index(drop=True)
         quotient.index = quotient.index + 1
@@ -182,6 +335,8 @@ class MackChainLadder(BaseChainLadder):
         dfsumm.loc["total", "std_error"] = np.sqrt(mse_total.dropna().sum())
         dfsumm.loc["total", "cv"] = dfsumm.loc["total", "std_error"] / dfsumm.loc["total", "reserve"]
 
+        from scipy.stats import norm, lognorm
+
         if dist=="norm":
             std_params, mean_params = dfsumm["std_error"], dfsumm["reserve"]
             rv_list = [norm(loc=ii, scale=jj) for ii,jj in zip(mean_params, std_params)]
@@ -259,6 +414,74 @@ class MackChainLadder(BaseChainLadder):
         return(qtls, qtlhdrs)
 
 
+    @classmethod
+    def batch_fit(cls, tris, alpha=1, dtype=np.float64):
+        """
+        Compute Mack ldfs, development period variance, ultimates and
+        reserves for a stack of same-shaped cumulative triangles in a
+        single vectorized pass. Intended for bootstrap and simulation
+        workflows in which many resampled triangles are fit at once.
+        Each triangle must be square with all cells on or above the latest
+        diagonal populated and all cells below it NaN. Every age-to-age
+        factor receives full weight and a tail factor of 1.0 is assumed.
+
+        Parameters
+        ----------
+        tris: np.ndarray
+            Cumulative triangles with shape ``(B, n, n)``, indexed by
+            triangle, origin period and development period.
+
+        alpha: {0, 1, 2}
+            * ``0``: Straight average of observed individual link ratios.
+            * ``1``: Historical Chain Ladder age-to-age factors.
+            * ``2``: Regression of $C_{k+1}$ on $C_{k}$ with 0 intercept.
+
+        dtype: np.dtype
+            Floating point type used for the fit. ``np.float32`` halves
+            memory traffic for large simulated batches at the cost of
+            precision. Defaults to ``np.float64``.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            ldfs and devpvar with shape ``(B, n - 1)`` and type ``dtype``,
+            followed by float64 ultimates and reserves with shape ``(B, n)``.
+
+        Examples
+        --------
+        Fit two copies of the raa triangle at once::
+
+            In [1]: import numpy as np
+            In [2]: import trikit
+            In [3]: from trikit.estimators.chainladder.mack import MackChainLadder
+            In [4]: tri = trikit.totri(trikit.load("raa"))
+            In [5]: tris = np.stack([tri.to_numpy(), tri.to_numpy()])
+            In [6]: ldfs, devpvar, ultimates, reserves = MackChainLadder.batch_fit(tris)
+        """
+        tris = np.asarray(tris, dtype=dtype)
+        if tris.ndim!=3 or tris.shape[1]!=tris.shape[2]:
+            raise ValueError(
+                "tris must have shape (B, n, n), not `{}`.".format(tris.shape)
+                )
+
+        n = tris.shape[1]
+        w = np.broadcast_to(
+            _batch_weights(n, np.dtype(dtype)), (tris.shape[0], n - 1, n - 1)
+            )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            C, F = tris[:, :-1, :-1], tris[:, :-1, 1:] / tris[:, :-1, :-1]
+        ldfs, devpvar = _mack_core(C, w, F, n, alpha=alpha, dtype=dtype)
+
+        # Cumulative ldfs (tail of 1.0) applied to the latest diagonal,
+        # accumulated in float64 regardless of dtype.
+        cldfs = np.cumprod(ldfs[:, ::-1].astype(np.float64), axis=1)[:, ::-1]
+        cldfs = np.concatenate([cldfs, np.ones((tris.shape[0], 1))], axis=1)
+        latest = tris[:, np.arange(n), np.arange(n)[::-1]].astype(np.float64)
+        ultimates = latest * cldfs[:, ::-1]
+        reserves = ultimates - latest
+        return(ldfs, devpvar, ultimates, reserves)
+
+
     @property
     def mod_tri(self):
         """
@@ -270,30 +493,89 @@ class MackChainLadder(BaseChainLadder):
         pd.DataFrame
         """
         if self._mod_tri is None:
-            self._mod_tri = self.tri.copy(deep=True)
-            for ii in range(self.tri.latest.shape[0]):
-                r_indx = self.tri.latest.loc[ii, "origin"]
-                c_indx = self.tri.latest.loc[ii, "dev"]
-                self._mod_tri.loc[r_indx, c_indx] = np.NaN
-            self._mod_tri = self._mod_tri.dropna(axis=0, how="all").dropna(axis=1, how="all")
-            
+            latest = self.tri.latest
+            r_indx = self.tri.index.get_indexer(latest["origin"].values)
+            c_indx = self.tri.columns.get_indexer(latest["dev"].values)
+            tri_arr = self._tri_np.copy()
+            tri_arr[r_indx, c_indx] = np.NaN
+
+            # Drop rows and columns left entirely NaN in a single pass.
+            isnan = np.isnan(tri_arr)
+            keep_r, keep_c = ~isnan.all(axis=1), ~isnan.all(axis=0)
+            mod_arr = tri_arr[np.ix_(keep_r, keep_c)]
+            self._mod_tri = pd.DataFrame(
+                mod_arr, index=self.tri.index[keep_r],
+                columns=self.tri.columns[keep_c], copy=False
+                )
+
         return(self._mod_tri)
 
 
     @property
     def mod_a2aind(self):
         """
-        Return self.tri.a2aind with lower right 0s replaced with NaN.
+        Return self.tri.a2aind as float64 weights: 1 for cells included in
+        the ldf calculation, 0 for excluded cells. self.tri.a2aind drops
+        all-NaN columns, so it is aligned with self.mod_tri, with cells
+        absent from self.tri.a2aind set to 0.
 
         Returns
         -------
         pd.DataFrame
         """
         if self._mod_a2aind is None:
-            self._mod_a2aind = self.tri.a2aind.replace(0, np.NaN)
+            self._mod_a2aind = self._a2aind.reindex(
+                index=self.mod_tri.index, columns=self.mod_tri.columns, fill_value=0
+                ).astype(np.float64)
         return(self._mod_a2aind)
 
 
+    def _mod_arrays(self):
+        """
+        Return float64 values of ``self.mod_tri``, ``self.mod_a2aind`` and
+        ``self.tri.a2a``, the latter aligned with ``self.mod_tri``.
+        Conversion from DataFrame happens once, on first access.
+
+        Returns
+        -------
+        tuple of np.ndarray
+        """
+        if self._mod_values is None:
+            mod_tri = self.mod_tri
+            self._mod_values = (
+                mod_tri.to_numpy(dtype=np.float64),
+                self.mod_a2aind.to_numpy(dtype=np.float64),
+                self._a2a.reindex(
+                    index=mod_tri.index, columns=mod_tri.columns
+                    ).to_numpy(dtype=np.float64),
+                )
+        return(self._mod_values)
+
+
+    def _ldfs_np(self, alpha=1):
+        """
+        Compute Mack loss development factors excluding the tail factor.
+        Returned array is read-only and shared between calls.
+
+        Parameters
+        ----------
+        alpha: {0, 1, 2}
+            * ``0``: Straight average of observed individual link ratios.
+            * ``1``: Historical Chain Ladder age-to-age factors.
+            * ``2``: Regression of $C_{k+1}$ on $C_{k}$ with 0 intercept.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        if alpha not in self._ldfs_cache:
+            C, w, F = self._mod_arrays()
+            ldfs, _ = _mack_core(C, w, F, self._n, alpha=alpha)
+            ldfs.flags.writeable = False
+            self._ldfs_cache[alpha] = ldfs
+        return(self._ldfs_cache[alpha])
+
+
     def _ldfs(self, alpha=1, tail=1.0):
         """
         Compute Mack loss development factors.
@@ -313,11 +595,13 @@ class MackChainLadder(BaseChainLadder):
         -------
         pd.Series
         """
-        C, w = self.mod_tri, self.mod_a2aind
-        ldfs = (self.tri.a2a * w * C**alpha).sum(axis=0) / (w * C**alpha).sum(axis=0)
-        increment = np.unique(ldfs.index[1:] - ldfs.index[:-1])[0]
-        ldfs.loc[ldfs.index.max() + increment] = tail
-        return(ldfs)
+        if self._ldfs_index is None:
+            devp = self.mod_tri.columns
+            increment = np.unique(devp[1:] - devp[:-1])[0]
+            self._ldfs_index = devp.append(pd.Index([devp.max() + increment]))
+        return(pd.Series(
+            np.append(self._ldfs_np(alpha=alpha), tail), index=self._ldfs_index
+            ))
 
 
     def _ldf_variance(self, devpvar, alpha=1):
@@ -339,11 +623,10 @@ class MackChainLadder(BaseChainLadder):
         -------
         pd.Series
         """
-        ldfvar = pd.Series(index=devpvar.index, dtype=np.float, name="ldfvar")
-        C, w = self.mod_tri, self.mod_a2aind
-        for devp in w.columns:
-            ldfvar[devp] = devpvar[devp] / (w.loc[:,devp] * C.loc[:, devp]**alpha).sum()
-        return(ldfvar)
+        C, w, _ = self._mod_arrays()
+        Ca = w * _pow_alpha(C, alpha)
+        ldfvar = devpvar.values / np.nansum(Ca, axis=0)
+        return(pd.Series(ldfvar, index=devpvar.index, dtype=np.float, name="ldfvar"))
 
 
     def _devp_variance(self, ldfs, alpha=1):
@@ -367,18 +650,33 @@ class MackChainLadder(BaseChainLadder):
         -------
         pd.Series
         """
-        devpvar = pd.Series(index=ldfs.index[:-1], dtype=np.float, name="devpvar")
-        C, w, F = self.mod_tri, self.mod_a2aind, self.tri.a2a
-        n = self.tri.origins.size
-        for indx, jj in enumerate(self.tri.devp[:-2]):
-            devpvar[jj] = \
-                (w[jj] * (C[jj]**alpha) * (F[jj] - ldfs[jj])**2).sum() / (n - indx - 2)
-
-        # Calculate development period variance for period n-1.
-        devpvar.iloc[-1] = np.min((
-            devpvar.iloc[-2]**2 / devpvar.iloc[-3],
-            np.min([devpvar.iloc[-2], devpvar.iloc[-3]])
-            ))
+        devpvar = self._devp_variance_np(ldfs.values[:-1], alpha=alpha)
+        return(pd.Series(devpvar, index=ldfs.index[:-1], dtype=np.float, name="devpvar"))
+
+
+    def _devp_variance_np(self, ldfs, alpha=1):
+        """
+        Compute the development period variance from ldfs given as an
+        array excluding the tail factor, e.g. the output of
+        ``self._ldfs_np``.
+
+        Parameters
+        ----------
+        ldfs: np.ndarray
+            Selected ldfs excluding the tail factor.
+
+        alpha: {0, 1, 2}
+            * ``0``: Straight average of observed individual link ratios.
+            * ``1``: Historical Chain Ladder age-to-age factors.
+            * ``2``: Regression of $C_{k+1}$ on $C_{k}$ with 0 intercept.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        C, w, F = self._mod_arrays()
+        n = self._n
+        _, devpvar = _mack_core(C, w, F, n, alpha=alpha, ldfs=ldfs)
         return(devpvar)
 
 
@@ -417,7 +715,7 @@ class MackChainLadder(BaseChainLadder):
         trisqrd = self._trisqrd(ldfs).drop("ultimate", axis=1)
         trisqrd.index = range(1, trisqrd.index.size + 1)
         trisqrd.columns = range(1, trisqrd.columns.size + 1)
-        n = self.tri.devp.size
+        n = self.tri.columns.size
 
         # `ii` iterates by origin, `kk` by development period.
         for ii in dfpe.index[1:]:
@@ -469,7 +767,7 @@ class MackChainLadder(BaseChainLadder):
         trisqrd = self._trisqrd(ldfs).drop("ultimate", axis=1)
         trisqrd.index = range(1, trisqrd.index.size + 1)
         trisqrd.columns = range(1, trisqrd.columns.size + 1)
-        n = self.tri.devp.size
+        n = self.tri.columns.size
 
         # `ii` iterates by origin, `kk` by development period.
         for ii in dfpe.index[1:]:
@@ -766,6 +1064,8 @@ class MackChainLadderResult(BaseChainLadderResult):
         -------
         tuple
         """
+        from scipy.stats import norm
+
         def fnorm(x, p):
             return(norm.cdf(x) - norm.cdf(-x) - p)
 
@@ -880,6 +1180,8 @@ class MackChainLadderResult(BaseChainLadderResult):
         -------
         tuple
         """
+        from scipy.stats import norm
+
         dfcy = self._cy_effects_table().sum()
         Z = dfcy.get("Z")
         mu = dfcy.get("E_Z")
@@ -111,6 +111,7 @@ class MackChainLadderTestCase(unittest.TestCase):
         df["origin"] = df["origin"] + 2000
         tri = trikit.totri(df, tri_type="cum", data_shape="tabular", data_format="incr")
         mcl = chainladder.mack.MackChainLadder(cumtri=tri)
+        self.tri = tri
         r_lognorm = mcl(alpha=1, dist="lognorm")
         r_norm = mcl(alpha=1, dist="norm")
 
@@ -272,6 +273,104 @@ class MackChainLadderTestCase(unittest.TestCase):
     def test_devp_corr_test(self):
         pass
 
+    def test_misaligned_a2a(self):
+        # Test triangle whose a2a drops a trailing all-NaN column vs. reference.
+        df = trikit.load(dataset="lrdb", lob="comauto", grcode=266)
+        mcl = chainladder.mack.MackChainLadder(cumtri=trikit.totri(df, tri_type="cum"))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ldfs = mcl._ldfs(alpha=1)
+            devpvar = mcl._devp_variance(ldfs, alpha=1)
+            ldfvar = mcl._ldf_variance(devpvar, alpha=1)
+        ldfs_ref = np.asarray([
+            2.1564295183384887, 1.5591309453904874, 1.3866858237547892,
+            1.2688427299703264, 1.2171401059220028, 1.177673483070734,
+            1.1415270018621975, 1.1318681318681318, np.NaN, 1.0,
+            ])
+        devpvar_ref = np.asarray([
+            15.100995024089839, 5.52191932868668, 2.916914572717428,
+            0.2956025617015567, 0.11659008002662623, 0.08365017493895366,
+            0.009964109647615054, 0.0, 0.0,
+            ])
+        ldfvar_ref = np.asarray([
+            0.0033364991215399553, 0.0006484931683718943, 0.0002793979475782977,
+            3.508635747199486e-05, 2.806694271223549e-05, 2.804229800166063e-05,
+            9.277569504297072e-06, 0.0, np.NaN,
+            ])
+        self.assertTrue(
+            np.allclose(ldfs.values, ldfs_ref, equal_nan=True) and
+            np.allclose(devpvar.values, devpvar_ref, equal_nan=True) and
+            np.allclose(ldfvar.values, ldfvar_ref, equal_nan=True),
+            "Non-equality between computed vs. reference misaligned a2a estimates."
+            )
+
+    def test_devpvar_non_square(self):
+        # Test devpvar of a triangle with fewer dev than origin periods vs. reference.
+        df = trikit.load(dataset="raa")
+        mcl = chainladder.mack.MackChainLadder(cumtri=trikit.totri(df[df["dev"]<=6], tri_type="cum"))
+        devpvar = mcl._devp_variance(mcl._ldfs(alpha=1), alpha=1)
+        devpvar_ref = np.asarray([
+            27883.479394043632, 1108.5262861330061, 691.4427845771144,
+            61.2299953904416, 5.422158447725292,
+            ])
+        self.assertTrue(
+            np.allclose(devpvar.values, devpvar_ref),
+            "Non-equality between computed vs. reference non-square devpvar."
+            )
+
+    def test_zero_loss_included_cell(self):
+        # Test triangle with included zero-loss cells (infinite a2a) vs. reference.
+        df = trikit.load(dataset="lrdb", lob="comauto", grcode=15792)
+        mcl = chainladder.mack.MackChainLadder(cumtri=trikit.totri(df, tri_type="cum"))
+        dldfs_ref = {
+            1:[4.770833333333333, 2.078602620087336, 1.68, 1.394736842105263,
+               1.2835283528352834, 1.2359121298949378, 1.191304347826087, 1., 1., 1.],
+            2:[3.7284644194756553, 1.9516441005802707, 1.6858301941466243,
+               1.4039770793146489, 1.2894526040183483, 1.2355817323004186,
+               1.190198569898099, 1., 1., 1.],
+            }
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dldfs = {alpha:mcl._ldfs(alpha=alpha).values for alpha in dldfs_ref}
+        self.assertTrue(
+            all(np.allclose(dldfs[alpha], dldfs_ref[alpha]) for alpha in dldfs_ref),
+            "Non-equality between computed vs. reference zero-loss ldfs."
+            )
+
+    def test_batch_fit(self):
+        # Test each slice of batch_fit over distinct triangles vs. MackChainLadder.
+        tris = [self.tri, trikit.totri(trikit.load(dataset="raa"), tri_type="cum")]
+        tris_arr = np.stack([tri.to_numpy() for tri in tris])
+        for alpha in (0, 1, 2):
+            ldfs, devpvar, _, reserves = \
+                chainladder.mack.MackChainLadder.batch_fit(tris_arr, alpha=alpha)
+            for ii, tri in enumerate(tris):
+                with self.subTest(alpha=alpha, tri=ii):
+                    mcl = chainladder.mack.MackChainLadder(cumtri=tri)
+                    ldfs_ref = mcl._ldfs(alpha=alpha)
+                    devpvar_ref = mcl._devp_variance(ldfs_ref, alpha=alpha)
+                    reserves_ref = mcl(alpha=alpha).reserves.drop("total")
+                    self.assertTrue(
+                        np.allclose(ldfs[ii], ldfs_ref.values[:-1]) and
+                        np.allclose(devpvar[ii], devpvar_ref.values) and
+                        np.allclose(reserves[ii], reserves_ref.values),
+                        "Non-equality between batch_fit vs. MackChainLadder."
+                        )
+
+    def test_batch_fit_float32(self):
+        # Test each slice of float32 batch_fit vs. MackChainLadder reserves.
+        tris = [self.tri, trikit.totri(trikit.load(dataset="raa"), tri_type="cum")]
+        tris_arr = np.stack([tri.to_numpy() for tri in tris])
+        ldfs, _, _, reserves = \
+            chainladder.mack.MackChainLadder.batch_fit(tris_arr, dtype=np.float32)
+        reserves_ref = np.stack([
+            chainladder.mack.MackChainLadder(cumtri=tri)().reserves.drop("total").values
+            for tri in tris
+            ])
+        self.assertTrue(
+            ldfs.dtype==np.float32 and reserves.dtype==np.float64 and
+            np.allclose(reserves, reserves_ref, rtol=1e-5),
+            "Non-equality between float32 batch_fit vs. MackChainLadder reserves."
+            )
+
 
 
 
@@ -1,37 +1,81 @@
 """
 trikit.triangle tests.
 """
-import sys
 import unittest
 import pandas as pd
 import numpy as np
-import os
-import os.path
-import logging
-import timeit
 import trikit
 
 
 
+# Reference values shared across test cases. Tests must not modify these.
+
+_LATEST_REF_INCR = pd.DataFrame({
+    "origin":list(range(1981, 1991, 1)), "maturity":list(range(10, 0, -1)),
+    "dev":list(range(10, 0, -1)),
+    "latest":[
+        172.0, 535.0, 603.0, 984.0, 225.0, 2917.0, 1368.0,
+        6165.0, 2262.0, 2063.0
+        ],
+    }, index=list(range(0, 10, 1))
+    )
+
+_LATEST_REF_CUM = pd.DataFrame({
+    "origin":list(range(1981, 1991, 1)), "maturity":list(range(10, 0, -1)),
+    "dev":list(range(10, 0, -1)),
+    "latest":[18834.0, 16704.0, 23466.0, 27067.0, 26180.0, 15852.0, 12314.0, 13112.0, 5395.0, 2063.0],
+    }, index=list(range(0, 10, 1))
+    )
+
+
+# Array forms of the latest reference frames. The frames are in ascending
+# origin order, so reversing them gives ascending development period order.
+_ORIGINS_REF_ARR = _LATEST_REF_INCR["origin"].to_numpy()
+_MATURITY_REF_ARR = _LATEST_REF_INCR["maturity"].to_numpy()
+_DEVP_REF_ARR = _LATEST_REF_INCR["dev"].to_numpy()[::-1]
+
+_LATEST_REF_INCR_ARR = _LATEST_REF_INCR[["origin", "dev", "latest"]].to_numpy()
+_LATEST_BY_ORIGIN_REF_INCR_ARR = _LATEST_REF_INCR["latest"].to_numpy()
+_LATEST_BY_DEVP_REF_INCR_ARR = _LATEST_BY_ORIGIN_REF_INCR_ARR[::-1]
+
+_LATEST_REF_CUM_ARR = _LATEST_REF_CUM[["origin", "dev", "latest"]].to_numpy()
+_LATEST_BY_ORIGIN_REF_CUM_ARR = _LATEST_REF_CUM["latest"].to_numpy()
+_LATEST_BY_DEVP_REF_CUM_ARR = _LATEST_BY_ORIGIN_REF_CUM_ARR[::-1]
+
+_A2A_REF = pd.DataFrame({
+    1:[1.64984, 40.42453, 2.63695, 2.04332, 8.75916, 4.25975, 7.21724, 5.14212, 1.72199],
+    2:[1.31902, 1.25928, 1.54282, 1.36443, 1.65562, 1.81567, 2.72289, 1.88743, np.NaN],
+    3:[1.08233, 1.97665, 1.16348, 1.34885, 1.39991, 1.10537, 1.12498, np.NaN, np.NaN],
+    4:[1.14689, 1.29214, 1.16071, 1.10152, 1.17078, 1.22551,  np.NaN, np.NaN, np.NaN],
+    5:[1.19514, 1.13184, 1.1857 , 1.11347, 1.00867,np.NaN, np.NaN, np.NaN, np.NaN],
+    6:[1.11297, 0.9934 , 1.02922, 1.03773,  np.NaN, np.NaN,np.NaN, np.NaN, np.NaN],
+    7:[1.03326, 1.04343, 1.02637,np.NaN, np.NaN, np.NaN, np.NaN, np.NaN, np.NaN],
+    8:[1.0029 , 1.03309,np.NaN, np.NaN, np.NaN, np.NaN,np.NaN, np.NaN, np.NaN],
+    9:[1.00922,np.NaN, np.NaN, np.NaN, np.NaN, np.NaN, np.NaN, np.NaN, np.NaN],
+    }, index=list(range(1981, 1990))
+    )
+
+
+
 # IncrTriangle unit tests -----------------------------------------------------
 
 class IncrTriangleTestCase(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         data = trikit.load(dataset="raa")
-        self.tri = trikit.totri(data=data, tri_type="incremental")
-        self.latest_ref = pd.DataFrame({
-            "origin":list(range(1981, 1991, 1)), "maturity":list(range(10, 0, -1)),
-            "dev":list(range(10, 0, -1)),
-            "latest":[
-                172.0, 535.0, 603.0, 984.0, 225.0, 2917.0, 1368.0,
-                6165.0, 2262.0, 2063.0
-                ],
-            }, index=list(range(0, 10, 1))
-            )
+        cls.tri = trikit.totri(data=data, tri_type="incremental")
+        cls.latest_ref = _LATEST_REF_INCR
+
+        cls.offset_1 = np.asarray([54., 673., 649., 2658., 3786., 1233., 6926., 5596., 3133.])
+        cls.offset_2 = np.asarray([599., -103., 3479., 2159., 6333., 5257., 3463., 1351.])
+        cls.offset_7 = np.asarray([2638., 4179., 3410.])
 
-        self.offset_1 = np.asarray([54., 673., 649., 2658., 3786., 1233., 6926., 5596., 3133.])
-        self.offset_2 = np.asarray([599., -103., 3479., 2159., 6333., 5257., 3463., 1351.])
-        self.offset_7 = np.asarray([2638., 4179., 3410.])
+        cls.origins_ref = _ORIGINS_REF_ARR
+        cls.maturity_ref = _MATURITY_REF_ARR
+        cls.devp_ref = _DEVP_REF_ARR
+        cls.latest_arr_ref = _LATEST_REF_INCR_ARR
+        cls.latest_by_origin_ref = _LATEST_BY_ORIGIN_REF_INCR_ARR
+        cls.latest_by_devp_ref = _LATEST_BY_DEVP_REF_INCR_ARR
 
 
     def test_nbr_cells(self):
@@ -40,7 +84,10 @@ class IncrTriangleTestCase(unittest.TestCase):
             )
 
     def test_triind(self):
-        triindprod = (self.tri.triind * self.tri).sum().sum()
+        # Forecast cells of tri are NaN: zero them as pandas sum() skipped them.
+        triind = self.tri.triind.to_numpy(dtype=np.float64)
+        tri = np.nan_to_num(self.tri.to_numpy(dtype=np.float64))
+        triindprod = np.einsum("ij,ij->", triind, tri)
         self.assertTrue(
             np.allclose(triindprod, 0)
             )
@@ -50,7 +97,7 @@ class IncrTriangleTestCase(unittest.TestCase):
             "dev":list(range(10, 0, -1)),
             "col_offset":list(range(9, -1, -1)),
             }, index=list(range(1981, 1991, 1))
-            ).sort_index()
+            )
         self.assertTrue(ref.equals(self.tri.rlvi))
 
     def test_clvi(self):
@@ -58,51 +105,48 @@ class IncrTriangleTestCase(unittest.TestCase):
             "origin":list(range(1990, 1980, -1)),
             "row_offset":list(range(9, -1, -1)),
             }, index=list(range(1, 11, 1))
-            ).sort_index()
+            )
         self.assertTrue(ref.equals(self.tri.clvi))
 
     def test_devp(self):
         ref = pd.Series(
             data=self.latest_ref.dev.values.tolist()[::-1],
             name="devp"
-            ).sort_index()
+            )
         self.assertTrue(ref.equals(self.tri.devp))
 
     def test_origins(self):
         ref = pd.Series(
             data=self.latest_ref.origin.values.tolist(),
             name="origin"
-            ).sort_index()
+            )
         self.assertTrue(ref.equals(self.tri.origins))
 
     def test_maturity(self):
-        dfref = self.latest_ref[["origin", "maturity"]]
-        dftri = self.tri.maturity.to_frame().reset_index(drop=False).rename(
-            {"index":"origin", "maturity":"maturity_tri"}, axis=1)
-        dfcomp = dfref.merge(dftri, on="origin", how="left")
-        dfcomp["diff"] = dfcomp["maturity"] - dfcomp["maturity_tri"]
-        self.assertEqual(dfcomp["diff"].sum(), 0)
+        tri_maturity = self.tri.maturity
+        self.assertTrue(
+            np.array_equal(tri_maturity.index, self.origins_ref) and
+            np.array_equal(tri_maturity.to_numpy(), self.maturity_ref)
+            )
 
     def test_latest(self):
-        dfref = self.latest_ref[["origin", "dev", "latest"]].sort_index()
-        dftri = self.tri.latest.sort_index()
-        self.assertEqual((dfref - dftri).sum().sum(), 0)
+        fields = ["origin", "dev", "latest"]
+        tri_latest = self.tri.latest[fields].to_numpy()
+        self.assertTrue(np.array_equal(tri_latest, self.latest_arr_ref))
 
     def test_latest_by_origin(self):
-        dfref = self.latest_ref[["origin", "latest"]].sort_index()
-        dftri = self.tri.latest_by_origin.reset_index(drop=False).rename(
-            {"index":"origin", "latest_by_origin":"latest_tri"}, axis=1)
-        dfcomp = dfref.merge(dftri, on="origin", how="left")
-        dfcomp["diff"] = dfcomp["latest"] - dfcomp["latest_tri"]
-        self.assertEqual(dfcomp["diff"].sum(), 0)
+        tri_latest = self.tri.latest_by_origin
+        self.assertTrue(
+            np.array_equal(tri_latest.index, self.origins_ref) and
+            np.array_equal(tri_latest.to_numpy(), self.latest_by_origin_ref)
+            )
 
     def test_latest_by_devp(self):
-        dfref = self.latest_ref[["dev", "latest"]].sort_index()
-        dftri = self.tri.latest_by_devp.reset_index(drop=False).rename(
-            {"index":"dev", "latest_by_devp":"latest_tri"}, axis=1)
-        dfcomp = dfref.merge(dftri, on="dev", how="left")
-        dfcomp["diff"] = dfcomp["latest"] - dfcomp["latest_tri"]
-        self.assertEqual(dfcomp["diff"].sum(), 0)
+        tri_latest = self.tri.latest_by_devp
+        self.assertTrue(
+            np.array_equal(tri_latest.index, self.devp_ref) and
+            np.array_equal(tri_latest.to_numpy(), self.latest_by_devp_ref)
+            )
 
     def test_to_tbl(self):
         self.assertTrue(isinstance(self.tri.to_tbl(), pd.DataFrame))
@@ -130,32 +174,23 @@ class IncrTriangleTestCase(unittest.TestCase):
 
 class CumTriangleTestCase(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
 
         raa  = trikit.load(dataset="raa")
-        self.tri = trikit.totri(raa, tri_type="cumulative")
-
-        self.latest_ref = pd.DataFrame({
-            "origin":list(range(1981, 1991, 1)), "maturity":list(range(10, 0, -1)),
-            "dev":list(range(10, 0, -1)),
-            "latest":[18834.0, 16704.0, 23466.0, 27067.0, 26180.0, 15852.0, 12314.0, 13112.0, 5395.0, 2063.0],
-            }, index=list(range(0, 10, 1))
-            )
-
-        self.a2aref = pd.DataFrame({
-            1:[1.64984, 40.42453, 2.63695, 2.04332, 8.75916, 4.25975, 7.21724, 5.14212, 1.72199],
-            2:[1.31902, 1.25928, 1.54282, 1.36443, 1.65562, 1.81567, 2.72289, 1.88743, np.NaN],
-            3:[1.08233, 1.97665, 1.16348, 1.34885, 1.39991, 1.10537, 1.12498, np.NaN, np.NaN],
-            4:[1.14689, 1.29214, 1.16071, 1.10152, 1.17078, 1.22551,  np.NaN, np.NaN, np.NaN],
-            5:[1.19514, 1.13184, 1.1857 , 1.11347, 1.00867,np.NaN, np.NaN, np.NaN, np.NaN],
-            6:[1.11297, 0.9934 , 1.02922, 1.03773,  np.NaN, np.NaN,np.NaN, np.NaN, np.NaN],
-            7:[1.03326, 1.04343, 1.02637,np.NaN, np.NaN, np.NaN, np.NaN, np.NaN, np.NaN],
-            8:[1.0029 , 1.03309,np.NaN, np.NaN, np.NaN, np.NaN,np.NaN, np.NaN, np.NaN],
-            9:[1.00922,np.NaN, np.NaN, np.NaN, np.NaN, np.NaN, np.NaN, np.NaN, np.NaN],
-            }, index=list(range(1981, 1990))
-            )
-
-        self.tri_sparse = pd.DataFrame({
+        cls.tri = trikit.totri(raa, tri_type="cumulative")
+
+        cls.latest_ref = _LATEST_REF_CUM
+        cls.a2aref = _A2A_REF
+        cls.a2aref_arr = _A2A_REF.to_numpy()
+        cls.origins_ref = _ORIGINS_REF_ARR
+        cls.maturity_ref = _MATURITY_REF_ARR
+        cls.devp_ref = _DEVP_REF_ARR
+        cls.latest_arr_ref = _LATEST_REF_CUM_ARR
+        cls.latest_by_origin_ref = _LATEST_BY_ORIGIN_REF_CUM_ARR
+        cls.latest_by_devp_ref = _LATEST_BY_DEVP_REF_CUM_ARR
+
+        cls.tri_sparse = pd.DataFrame({
             1 :[np.NaN, 300, 370, 288, 412, 800, 746, 422,],
             2 :[np.NaN, 499, 501, 315, 222, np.NaN, 630, np.NaN],
             3 :[np.NaN, 277, 418, np.NaN, 255, 525, np.NaN, np.NaN,],
@@ -175,31 +210,32 @@ class CumTriangleTestCase(unittest.TestCase):
             )
 
     def test_a2a(self):
+        a2a = self.tri.a2a
         self.assertTrue(
-            np.abs((self.a2aref - self.tri.a2a).sum().sum())<.0001,
+            a2a.index.equals(self.a2aref.index) and
+            a2a.columns.equals(self.a2aref.columns) and
+            np.allclose(a2a.to_numpy(), self.a2aref_arr, atol=.0001, equal_nan=True),
             "Age-to-age Factors not properly computed."
             )
 
     def test_latest(self):
-        dfref = self.latest_ref[["origin", "dev", "latest"]].sort_index()
-        dftri = self.tri.latest.sort_index()
-        self.assertEqual((dfref - dftri).sum().sum(), 0)
+        fields = ["origin", "dev", "latest"]
+        tri_latest = self.tri.latest[fields].to_numpy()
+        self.assertTrue(np.array_equal(tri_latest, self.latest_arr_ref))
 
     def test_latest_by_origin(self):
-        dfref = self.latest_ref[["origin", "latest"]].sort_index()
-        dftri = self.tri.latest_by_origin.reset_index(drop=False).rename(
-            {"index":"origin", "latest_by_origin":"latest_tri"}, axis=1)
-        dfcomp = dfref.merge(dftri, on="origin", how="left")
-        dfcomp["diff"] = dfcomp["latest"] - dfcomp["latest_tri"]
-        self.assertTrue(np.allclose(dfcomp["diff"].sum(), 0))
+        tri_latest = self.tri.latest_by_origin
+        self.assertTrue(
+            np.array_equal(tri_latest.index, self.origins_ref) and
+            np.array_equal(tri_latest.to_numpy(), self.latest_by_origin_ref)
+            )
 
     def test_latest_by_devp(self):
-        dfref = self.latest_ref[["dev", "latest"]].sort_index()
-        dftri = self.tri.latest_by_devp.reset_index(drop=False).rename(
-            {"index":"dev", "latest_by_devp":"latest_tri"}, axis=1)
-        dfcomp = dfref.merge(dftri, on="dev", how="left")
-        dfcomp["diff"] = dfcomp["latest"] - dfcomp["latest_tri"]
-        self.assertTrue(np.allclose(dfcomp["diff"].sum(), 0))
+        tri_latest = self.tri.latest_by_devp
+        self.assertTrue(
+            np.array_equal(tri_latest.index, self.devp_ref) and
+            np.array_equal(tri_latest.to_numpy(), self.latest_by_devp_ref)
+            )
 
     def test_to_incr(self):
         self.assertTrue(isinstance(self.tri.to_incr(), trikit.triangle.IncrTriangle))
@@ -221,112 +257,57 @@ class CumTriangleTestCase(unittest.TestCase):
 
 class ToTriTestCase(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
 
         origin, dev, value = "origin", "dev", "value"
         incrtab = trikit.load(dataset="raa")
 
         # Create cumulative tabular data.
-        cumtab = incrtab.copy(deep=True).sort_values(by=["origin", "dev"]).reset_index(drop=True)
-        cumtab["cum"] = cumtab.groupby(["origin"], as_index=False)["value"].cumsum()
-        cumtab = cumtab.drop("value", axis=1).rename({"cum":"value"}, axis=1)
+        cumtab = incrtab.sort_values(by=[origin, dev], kind="mergesort", ignore_index=True)
+        cumtab[value] = cumtab.groupby(origin, sort=False)[value].cumsum()
 
         # Create incremental triangle data.
         incrtri = incrtab[[origin, dev, value]]
-        incrtri = incrtri.groupby([origin, dev], as_index=False).sum()
-        incrtri = incrtri.sort_values(by=[origin, dev])
-        incrtri = incrtri.pivot(index=origin, columns=dev).rename_axis(None)
-        incrtri.columns = incrtri.columns.droplevel(0)
-
-        # Create cumulative triangle data.
-        cumtri = incrtab[[origin, dev, value]]
-        cumtri = cumtri.groupby([origin, dev], as_index=False).sum()
-        cumtri = cumtri.sort_values(by=[origin, dev])
-        cumtri = cumtri.pivot(index=origin, columns=dev).rename_axis(None)
-        cumtri.columns = cumtri.columns.droplevel(0)
-
-        self.incrtab = incrtab
-        self.cumtab = cumtab
-        self.incrtri = incrtri
-        self.cumtri = cumtri
-
-        self.incr_latest_ref = pd.DataFrame({
-            "origin":list(range(1981, 1991, 1)), "maturity":list(range(10, 0, -1)),
-            "dev":list(range(10, 0, -1)),
-            "latest":[172.0, 535.0, 603.0, 984.0, 225.0, 2917.0, 1368.0,6165.0, 2262.0, 2063.0],
-            }, index=list(range(0, 10, 1))
-            )
-
-        self.cum_latest_ref = pd.DataFrame({
-            "origin":list(range(1981, 1991, 1)), "maturity":list(range(10, 0, -1)),
-            "dev":list(range(10, 0, -1)),
-            "latest":[18834.0, 16704.0, 23466.0, 27067.0, 26180.0, 15852.0, 12314.0, 13112.0, 5395.0, 2063.0],
-            }, index=list(range(0, 10, 1))
-            )
-
-    def test_cumtab_2_incrtri(self):
-        # Convert cumulative tabular data to incr triangle.
-        tri = trikit.totri(self.cumtab, tri_type="incr", data_format="cum", data_shape="tabular")
-        self.assertTrue(
-            isinstance(tri, trikit.triangle.IncrTriangle),
-            "Error converting cum tabular data to incr tri."
-            )
-
-    def test_cumtab_2_cumtri(self):
-        # Convert cumulative tabular data to cum triangle.
-        tri = trikit.totri(self.cumtab, tri_type="cum", data_format="cum", data_shape="tabular")
-        self.assertTrue(
-            isinstance(tri, trikit.triangle.CumTriangle),
-            "Error converting cum tabular data to cum tri."
-            )
-
-    def test_incrtab_2_incrtri(self):
-        # Convert incremental tabular data to incr triangle.
-        tri = trikit.totri(self.incrtab, tri_type="incr", data_format="incr", data_shape="tabular")
-        self.assertTrue(
-            isinstance(tri, trikit.triangle.IncrTriangle),
-            "Error converting incr tabular data to incr tri."
-            )
-
-    def test_incrtab_2_cumtri(self):
-        # Convert incremental tabular data to cum triangle.
-        tri = trikit.totri(self.incrtab, tri_type="cum", data_format="incr", data_shape="tabular")
-        self.assertTrue(
-            isinstance(tri, trikit.triangle.CumTriangle),
-            "Error converting incr tabular data to cum tri."
-            )
-
-    def test_incrtri_2_incrtri(self):
-        # Convert incremental DataFrame tri to incr triangle.
-        tri = trikit.totri(self.incrtri, tri_type="incr", data_format="incr", data_shape="triangle")
-        self.assertTrue(
-            isinstance(tri, trikit.triangle.IncrTriangle),
-            "Error converting incr tri data to incr tri."
-            )
-
-    def test_incrtri_2_cumtri(self):
-        # Convert incremental DataFrame tri to cum triangle.
-        tri = trikit.totri(self.incrtri, tri_type="cum", data_format="incr", data_shape="triangle")
-        self.assertTrue(
-            isinstance(tri, trikit.triangle.CumTriangle),
-            "Error converting incr tri data to cum tri."
-            )
-
-    def test_cumtri_2_incrtri(self):
-        # Convert cumulative DataFrame tri to incr triangle.
-        tri = trikit.totri(self.cumtri, tri_type="incr", data_format="cum", data_shape="triangle")
-        self.assertTrue(
-            isinstance(tri, trikit.triangle.IncrTriangle),
-            "Error converting cum tri data to incr tri."
-            )
-
-    def test_cumtri_2_cumtri(self):
-        # Convert cumulative DataFrame tri to cum triangle.
-        tri = trikit.totri(self.cumtri, tri_type="cum", data_format="cum", data_shape="triangle")
-        self.assertTrue(
-            isinstance(tri, trikit.triangle.CumTriangle),
-            "Error converting cumtri data to cumtri."
-            )
+        incrtri = incrtri.groupby([origin, dev], as_index=False, sort=True).sum()
+        incrtri = incrtri.pivot(index=origin, columns=dev, values=value).rename_axis(None)
+
+        # Create cumulative triangle data from incrtri, leaving missing
+        # cells missing.
+        cumtri = incrtri.fillna(0).cumsum(axis=1).where(incrtri.notna())
+
+        cls.incrtab = incrtab
+        cls.cumtab = cumtab
+        cls.incrtri = incrtri
+        cls.cumtri = cumtri
+
+        cls.incr_latest_ref = _LATEST_REF_INCR
+        cls.cum_latest_ref = _LATEST_REF_CUM
+
+    def test_totri_conversions(self):
+        # Convert each tabular and triangle fixture to incr and cum triangles.
+        IncrTriangle = trikit.triangle.IncrTriangle
+        CumTriangle = trikit.triangle.CumTriangle
+        conversions = [
+            ("cumtab", "incr", "cum", "tabular", IncrTriangle),
+            ("cumtab", "cum", "cum", "tabular", CumTriangle),
+            ("incrtab", "incr", "incr", "tabular", IncrTriangle),
+            ("incrtab", "cum", "incr", "tabular", CumTriangle),
+            ("incrtri", "incr", "incr", "triangle", IncrTriangle),
+            ("incrtri", "cum", "incr", "triangle", CumTriangle),
+            ("cumtri", "incr", "cum", "triangle", IncrTriangle),
+            ("cumtri", "cum", "cum", "triangle", CumTriangle),
+            ]
+        for src, tri_type, data_format, data_shape, expected in conversions:
+            with self.subTest(src=src, tri_type=tri_type):
+                tri = trikit.totri(
+                    getattr(self, src), tri_type=tri_type, data_format=data_format,
+                    data_shape=data_shape
+                    )
+                self.assertTrue(
+                    isinstance(tri, expected),
+                    "Error converting {} data to {} tri.".format(src, tri_type)
+                    )
 
     def test_alt_colnames(self):
         # Create triangle with different origin, dev and value names.
@@ -220,15 +220,16 @@ class _BaseTriangle(pd.DataFrame):
     @property
     def latest_by_origin(self):
         """
-        Return the latest loss amounts by origin year.
+        Return the latest loss amounts by origin year, sorted by origin.
 
         Returns
         -------
         pd.Series
         """
         if self._latest_by_origin is None:
+            latest = self.latest
             self._latest_by_origin = pd.Series(
-                data=self.latest["latest"].values, index=self.latest["origin"].values,
+                data=latest["latest"].values, index=latest["origin"].values,
                 name="latest_by_origin")
         return(self._latest_by_origin.sort_index())
 
@@ -236,15 +237,17 @@ class _BaseTriangle(pd.DataFrame):
     @property
     def latest_by_devp(self):
         """
-        Return the latest loss amounts by development period.
+        Return the latest loss amounts by development period, sorted by
+        development period.
 
         Returns
         -------
         pd.Series
         """
         if self._latest_by_devp is None:
+            latest = self.latest
             self._latest_by_devp = pd.Series(
-                data=self.latest["latest"].values, index=self.latest["dev"].values,
+                data=latest["latest"].values, index=latest["dev"].values,
                 name="latest_by_devp")
         return(self._latest_by_devp.sort_index())
 
@@ -280,7 +283,7 @@ class _BaseTriangle(pd.DataFrame):
     @property
     def maturity(self):
         """
-        Return the maturity for each origin period.
+        Return the maturity for each origin period, sorted by origin.
 
         Returns
         -------
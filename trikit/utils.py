@@ -4,11 +4,75 @@ the CAS Loss Reserving Database and other sample datasets.
 """
 import sys
 import os.path
+import functools
 import numpy as np
 import pandas as pd
 
 
 
+# Columns of the CAS Loss Reserving Database used by trikit and their
+# dtypes. Loss amounts are whole numbers and stay int64, the dtype pandas
+# infers for them.
+_LRDB_DTYPES = {
+    "loss_key"  :"category",
+    "grcode"    :np.int32,
+    "grname"    :"category",
+    "origin"    :np.int16,
+    "dev"       :np.int8,
+    "incrd_loss":np.int64,
+    "paid_loss" :np.int64,
+    "train_ind" :np.int8,
+    }
+
+
+
+@functools.lru_cache(maxsize=4)
+def _read_lrdb(lrdb_path, mtime):
+    """
+    Parse the CAS Loss Reserving Database (lrdb), restricted to the columns
+    in ``_LRDB_DTYPES`` and parsed directly to those dtypes in a single
+    block. Results are memoized, so the file is read once per process
+    unless it changes on disk. Callers must not modify the returned
+    DataFrame in place.
+
+    Parameters
+    ----------
+    lrdb_path: str
+        Location of CAS loss reserving database.
+
+    mtime: float
+        Modification time of ``lrdb_path``. Only used as part of the cache
+        key, so an updated file is re-read.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    return(pd.read_csv(
+        lrdb_path, sep=",", usecols=list(_LRDB_DTYPES), dtype=_LRDB_DTYPES,
+        low_memory=False,
+        ))
+
+
+
+def _lrdb(lrdb_path):
+    """
+    Return a shallow copy of the cached lrdb DataFrame for ``lrdb_path``.
+
+    Parameters
+    ----------
+    lrdb_path: str
+        Location of CAS loss reserving database.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    mtime = os.path.getmtime(lrdb_path)
+    return(_read_lrdb(lrdb_path, mtime).copy(deep=False))
+
+
+
 def _load(dataset, loss_type="incurred", lob="comauto", grcode=1767,
           grname=None, train_only=True, dataref=None):
     """
@@ -69,7 +133,10 @@ def _load(dataset, loss_type="incurred", lob="comauto", grcode=1767,
     try:
         dataset_  = dataset.lower()
         datapath = dataref[dataset_]
-        loss_data_init = pd.read_csv(datapath, delimiter=",")
+        if dataset_=="lrdb":
+            loss_data_init = _lrdb(datapath)
+        else:
+            loss_data_init = pd.read_csv(datapath, delimiter=",")
 
     except KeyError:
         print("Specified dataset does not exist: `{}`".format(dataset))
@@ -77,34 +144,48 @@ def _load(dataset, loss_type="incurred", lob="comauto", grcode=1767,
     # Additional filtering/subsetting if dataset="lrdb".
     if dataset=="lrdb":
         loss_field = "incrd_loss" if loss_type.lower().startswith("i") else "paid_loss"
-        loss_data = loss_data_init[
-            ["loss_key", "grcode", "grname", "origin", "dev", loss_field, "train_ind"]
-            ]
+        loss_data = loss_data_init
+
+        # Combine all active selections into a single mask, applied once.
+        # Each selection must match at least one record remaining after the
+        # selections preceding it.
+        mask = np.ones(loss_data.shape[0], dtype=bool)
 
         if lob is not None:
-            if lob not in loss_data["loss_key"].unique():
+            if lob not in loss_data["loss_key"].cat.categories:
                 raise ValueError("`{}` is not a valid lob selection.".format(lob))
-            loss_data = loss_data[loss_data.loss_key==lob].reset_index(drop=True)
+            mask &= (loss_data["loss_key"]==lob).to_numpy()
 
         if grcode is not None:
-            if grcode not in loss_data["grcode"].unique():
+            grcode_mask = mask & (loss_data["grcode"]==grcode).to_numpy()
+            if not grcode_mask.any():
                 raise ValueError("`{}` is not a valid grcode selection.".format(grcode))
-            loss_data = loss_data[loss_data.grcode==grcode].reset_index(drop=True)
+            mask = grcode_mask
 
         if grname is not None:
-            if grname not in loss_data["grname"].unique():
+            # Names absent from the database are rejected without a scan.
+            is_valid = grname in loss_data["grname"].cat.categories
+            if is_valid:
+                grname_mask = mask & (loss_data["grname"]==grname).to_numpy()
+                is_valid = grname_mask.any()
+            if not is_valid:
                 raise ValueError("`{}` is not a valid grname selection.".format(grname))
-            loss_data = loss_data[loss_data.grname==grname].reset_index(drop=True)
+            mask = grname_mask
 
         if train_only:
-            loss_data = loss_data[loss_data.train_ind==1].reset_index(drop=True)
+            mask &= (loss_data["train_ind"]==1).to_numpy()
 
-        loss_data = loss_data.rename({loss_field:"value"}, axis=1)
+        # Build the result directly from the selected values.
+        loss_data = pd.DataFrame({
+            "origin":loss_data["origin"].to_numpy(dtype=np.int64)[mask],
+            "dev":loss_data["dev"].to_numpy(dtype=np.int64)[mask],
+            "value":loss_data[loss_field].to_numpy()[mask],
+            })
 
     else: # Specified dataset is not "lrdb".
-        loss_data = loss_data_init
+        loss_data = loss_data_init[["origin", "dev", "value"]].reset_index(drop=True)
 
-    return(loss_data[["origin", "dev", "value"]].reset_index(drop=True))
+    return(loss_data)
 
 
 
@@ -142,7 +223,7 @@ def _get_lrdb_lobs(lrdb_path):
     -------
     list
     """
-    lrdb = pd.read_csv(lrdb_path, sep=",")
+    lrdb = _lrdb(lrdb_path)
     lrdb = lrdb["loss_key"].unique()
     return(lrdb.tolist())
 
@@ -163,9 +244,10 @@ def _get_lrdb_groups(lrdb_path):
     dict
     """
     fields = ["grcode", "grname"]
-    lrdb   = pd.read_csv(lrdb_path, sep=",")
+    lrdb   = _lrdb(lrdb_path)
     lrdb   = lrdb[fields].drop_duplicates().reset_index(drop=True)
-    return({jj:ii for ii,jj in set(zip(lrdb.grname, lrdb.grcode))})
+    codes, names = lrdb["grcode"].to_numpy(), lrdb["grname"].to_numpy()
+    return(dict(zip(codes.tolist(), names.tolist())))
 
 
 
@@ -184,8 +266,12 @@ def _get_lrdb_specs(lrdb_path):
     pd.DataFrame
     """
     fields = ["loss_key", "grcode", "grname"]
-    lrdb = pd.read_csv(lrdb_path, sep=",")
-    lrdb = lrdb[fields].drop_duplicates().reset_index(drop=True)
-    lrdb = lrdb.sort_values(by=["loss_key","grcode"])
-    return(lrdb)
+    lrdb = _lrdb(lrdb_path)
+    lrdb = lrdb.groupby(fields, observed=True).size().reset_index(name="n")
+    # The order of observed categorical groups differs across pandas
+    # versions, so sort explicitly. Names are returned as object dtype, as
+    # before categorical parsing was introduced.
+    lrdb = lrdb.drop("n", axis=1).sort_values(by=["loss_key", "grcode"])
+    lrdb = lrdb.astype({"loss_key":object, "grname":object})
+    return(lrdb.reset_index(drop=True))
 